@@ -0,0 +1,86 @@
+# cython: language_level=3
+"""
+Cython build of json_to_csv.build_encounter_rows.
+
+Build it in place with `cythonize -i fastrows.pyx`; json_to_csv.py imports
+the compiled module when present and uses its pure-Python version otherwise.
+Keep the two in step.
+"""
+
+from sys import intern
+
+
+cdef inline object _intern(object value):
+    """Intern low-cardinality strings so repeated values share one object."""
+    return intern(value) if type(value) is str else value
+
+
+cpdef tuple build_encounter_rows(dict enc, object run_id, Py_ssize_t idx):
+    """Build (encounter_row, participant_rows) for one encounter dict."""
+    cdef object encounter_id, team_size, enemy_species, enemy_level
+    cdef object species_id, level
+    cdef list team_species, team_levels, participant_rows
+    cdef Py_ssize_t slot_idx, n_species, n_levels
+    cdef tuple encounter_row
+
+    # Use provided encounter_id or synthesize from run_id + index
+    encounter_id = enc.get("encounter_id")
+    if not encounter_id:
+        encounter_id = f"{run_id}_{idx:03d}"
+
+    # Team snapshot: arrays of species IDs and levels, plus team_size
+    team_species = enc.get("team_species_ids") or []
+    team_levels = enc.get("team_levels") or []
+    team_size = enc.get("team_size")
+    n_species = len(team_species)
+    n_levels = len(team_levels)
+
+    enemy_species = enc.get("enemy_species")
+    enemy_level = enc.get("enemy_level")
+
+    # Wide encounter row (kept for v1 compatibility)
+    encounter_row = (
+        encounter_id,
+        run_id,
+        enc.get("battle_index", idx),
+        enemy_species,
+        _intern(enc.get("enemy_type1")),
+        _intern(enc.get("enemy_type2")),
+        enemy_level,
+        enc.get("is_boss"),
+        _intern(enc.get("encounter_result")),
+        enc.get("enemy_ended_run"),
+        enc.get("notes"),
+
+        # Team snapshot fields (wide): size, ally1..6 species, ally1..6 levels
+        team_size,
+        team_species[0] if n_species > 0 else None,
+        team_species[1] if n_species > 1 else None,
+        team_species[2] if n_species > 2 else None,
+        team_species[3] if n_species > 3 else None,
+        team_species[4] if n_species > 4 else None,
+        team_species[5] if n_species > 5 else None,
+        team_levels[0] if n_levels > 0 else None,
+        team_levels[1] if n_levels > 1 else None,
+        team_levels[2] if n_levels > 2 else None,
+        team_levels[3] if n_levels > 3 else None,
+        team_levels[4] if n_levels > 4 else None,
+        team_levels[5] if n_levels > 5 else None,
+    )
+
+    # --- Tall participant rows ---
+    participant_rows = []
+
+    # Enemy as a participant
+    if enemy_species is not None:
+        participant_rows.append((encounter_id, run_id, "enemy", 0, enemy_species, enemy_level))
+
+    # Allies as participants (one row per ally slot)
+    for slot_idx in range(n_species):
+        species_id = team_species[slot_idx]
+        if species_id is None:
+            continue
+        level = team_levels[slot_idx] if slot_idx < n_levels else None
+        participant_rows.append((encounter_id, run_id, "ally", slot_idx, species_id, level))
+
+    return encounter_row, participant_rows
@@ -45,9 +45,29 @@ Missing fields are handled gracefully and filled with defaults/None.
 """
 
 import csv
+import io
 import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from datetime import datetime
+from sys import intern
+
+try:
+    # Optional: orjson parses run files several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: pyarrow adds a columnar Parquet copy of encounters.csv
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 
 # ---------- CONFIG ----------
@@ -62,44 +82,462 @@ RUNS_CSV = DATA_PROCESSED_DIR / "runs.csv"
 ENCOUNTERS_CSV = DATA_PROCESSED_DIR / "encounters.csv"
 PARTICIPANTS_CSV = DATA_PROCESSED_DIR / "encounter_participants.csv"  # NEW
 
+# Written alongside the CSVs when pyarrow is installed
+ENCOUNTERS_PARQUET = DATA_PROCESSED_DIR / "encounters.parquet"
+
+# Output buffering: 1 MiB file buffers, and rows handed to csv.writer in
+# batches so most of the work happens inside its C writerows loop
+CSV_BUFFER_SIZE = 1 << 20
+CSV_BATCH_ROWS = 10_000
+
+# Raw files at least this big are memory-mapped instead of read into bytes
+MMAP_MIN_BYTES = 1 << 20
+
+# Parse run files in worker processes once there are enough of them to pay
+# for starting the pool (and more than one CPU to run them on); results are
+# still written in sorted file order
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNKSIZE = 16
+
+# ProcessPoolExecutor raises ValueError for more workers than this on Windows
+WINDOWS_MAX_WORKERS = 61
+
+# Define column order explicitly to match schema_v1 (with team fields)
+RUN_FIELDNAMES = [
+    "run_id",
+    "start_timestamp",
+    "end_timestamp",
+    "result",
+    "final_stage",
+    "final_boss",
+    "starter_species",
+    "total_battles",
+    "session_date",
+    "session_day_of_week",
+    "time_of_day_bucket",
+    "run_tag",
+]
+
+ENCOUNTER_FIELDNAMES = [
+    "encounter_id",
+    "run_id",
+    "battle_index",
+    "enemy_species",
+    "enemy_type1",
+    "enemy_type2",
+    "enemy_level",
+    "is_boss",
+    "encounter_result",
+    "enemy_ended_run",
+    "notes",
+    "team_size",
+    "ally1_species_id",
+    "ally2_species_id",
+    "ally3_species_id",
+    "ally4_species_id",
+    "ally5_species_id",
+    "ally6_species_id",
+    "ally1_level",
+    "ally2_level",
+    "ally3_level",
+    "ally4_level",
+    "ally5_level",
+    "ally6_level",
+]
+
+PARTICIPANT_FIELDNAMES = [  # NEW
+    "encounter_id",
+    "run_id",
+    "side",
+    "slot_index",
+    "species_id",
+    "level",
+]
+
+# orjson turns integers beyond 64 bits into floats instead of rejecting them,
+# so a float at least this large means the file has to go to stdlib json
+_ORJSON_LOSSY_FLOAT = float(2 ** 63)
+
 
 # ---------- HELPERS ----------
 
 def parse_timestamp(ts: str):
-    """Parse ISO-ish timestamp (handles trailing 'Z'). Returns datetime or None."""
+    """Parse ISO-ish timestamp (handles trailing 'Z').
+
+    Returns (datetime, text), where text is the trimmed input without the
+    trailing 'Z' and is written to the CSVs as-is; (None, None) if empty.
+    """
     if not ts:
-        return None
+        return None, None
     ts = ts.strip()
     # Remove trailing 'Z' if present
-    if ts.endswith("Z"):
-        ts = ts[:-1]
+    text = ts[:-1] if ts.endswith("Z") else ts
     # fromisoformat handles 'YYYY-MM-DDTHH:MM:SS' and variants with microseconds
-    return datetime.fromisoformat(ts)
+    return datetime.fromisoformat(text), text
+
+
+# Time-of-day bucket label for each hour 0..23:
+# Morning 5-11, Afternoon 12-16, Evening 17-21, Late Night otherwise
+_TOD_TABLE = ("Late Night",) * 5 + ("Morning",) * 7 + ("Afternoon",) * 5 + ("Evening",) * 5 + ("Late Night",) * 2
+
+
+def _intern(value):
+    """Intern low-cardinality strings so repeated values share one object."""
+    return intern(value) if type(value) is str else value
+
+
+@contextmanager
+def _json_buffer(path: str):
+    """Yield a file's contents, memory-mapped when large to skip the read() copy."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size or size < MMAP_MIN_BYTES:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                # The map can only be closed once no views are exported
+                view.release()
+
+
+def _load_with_stdlib(path: str):
+    """Parse a run file with stdlib json, which also accepts NaN/Infinity."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_json_files(directory: Path):
+    """Return the sorted paths (as str) of the *.json files in directory.
+
+    Uses os.scandir, whose entries carry the file type, instead of building
+    and stat-ing a Path per entry as Path.glob does.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def _has_lossy_float(obj):
+    """True if a value of obj, or an item of a list value, may be a lost int."""
+    for value in obj.values():
+        if type(value) is float:
+            if abs(value) >= _ORJSON_LOSSY_FLOAT:
+                return True
+        elif type(value) is list:
+            for item in value:
+                if type(item) is float and abs(item) >= _ORJSON_LOSSY_FLOAT:
+                    return True
+    return False
+
+
+def _load_with_orjson(path: str):
+    """Parse a run file with orjson; None means it has to go to stdlib json.
+
+    That is the case for invalid JSON (orjson rejects NaN/Infinity) and for
+    files where the run or an encounter holds an integer orjson could only
+    return as a lossy float.
+    """
+    with _json_buffer(path) as buf:
+        try:
+            data = orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            return None
+
+    if type(data) is dict:
+        run = data.get("run")
+        if type(run) is dict and _has_lossy_float(run):
+            return None
+        encounters = data.get("encounters")
+        if type(encounters) is list:
+            for enc in encounters:
+                if type(enc) is dict and _has_lossy_float(enc):
+                    return None
+    return data
+
+
+def load_run_file(path: str):
+    """Load a single JSON file and return (run_dict, encounters_list).
+
+    orjson is tried first when installed; anything it rejects as invalid
+    JSON is retried with the stdlib parser, so edge cases behave as before.
+    """
+    if orjson is not None:
+        data = _load_with_orjson(path)
+        if data is None:
+            data = _load_with_stdlib(path)
+    else:
+        data = _load_with_stdlib(path)
 
+    # A missing or null "run" / "encounters" is treated as empty
+    run = data.get("run") or {}
+    encounters = data.get("encounters") or []
+    return run, encounters
 
-def time_of_day_bucket(dt: datetime):
-    """Return a simple time-of-day bucket label from a datetime."""
-    if dt is None:
-        return None
-    hour = dt.hour
-    if 5 <= hour < 12:
-        return "Morning"
-    elif 12 <= hour < 17:
-        return "Afternoon"
-    elif 17 <= hour < 22:
-        return "Evening"
-    else:
-        return "Late Night"
 
+def _open_csv(path: Path):
+    """Open a CSV for writing as raw file -> CSV_BUFFER_SIZE BufferedWriter -> UTF-8 text."""
+    raw = open(path, "wb", buffering=0)
+    buffered = io.BufferedWriter(raw, buffer_size=CSV_BUFFER_SIZE)
+    return io.TextIOWrapper(buffered, encoding="utf-8", newline="", write_through=False)
+
+
+def _open_encounters_parquet():
+    """Open a zstd ParquetWriter for encounters, or a no-op context without pyarrow."""
+    if pa is None:
+        return nullcontext()
+    text_columns = {"encounter_id", "run_id", "enemy_type1", "enemy_type2", "encounter_result", "notes"}
+    flag_columns = {"is_boss", "enemy_ended_run"}
+    schema = pa.schema([
+        (name, pa.string() if name in text_columns else pa.bool_() if name in flag_columns else pa.int64())
+        for name in ENCOUNTER_FIELDNAMES
+    ])
+    return pq.ParquetWriter(ENCOUNTERS_PARQUET, schema, compression="zstd")
+
+
+def _write_parquet_batch(writer, rows):
+    """Append encounter rows to the Parquet file as one row group.
+
+    Returns the writer, or None once Parquet output has been given up because
+    a value did not fit the schema; the CSVs are not affected.
+    """
+    if writer is None or not rows:
+        return writer
+    schema = writer.schema
+    try:
+        # Arrow wants columns, so transpose here; the CSV path keeps its rows
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*rows), schema)],
+            schema=schema,
+        )
+    except (pa.ArrowException, OverflowError) as exc:
+        print(f"Skipping {ENCOUNTERS_PARQUET}: {exc}")
+        writer.close()
+        ENCOUNTERS_PARQUET.unlink()
+        return None
+    writer.write_table(table)
+    return writer
+
+
+def _flush_rows(writer, rows):
+    """Write buffered rows in one writerows call, clear them and return how many."""
+    writer.writerows(rows)
+    count = len(rows)
+    rows.clear()
+    return count
+
+
+def _flush_encounters(writer, parquet_writer, rows):
+    """Flush encounter rows to the CSV and then to Parquet.
+
+    Returns (count, parquet_writer). The CSV goes first so a problem with the
+    optional Parquet copy can never cost CSV rows.
+    """
+    writer.writerows(rows)
+    parquet_writer = _write_parquet_batch(parquet_writer, rows)
+    count = len(rows)
+    rows.clear()
+    return count, parquet_writer
+
+
+# ---------- PER-FILE PROCESSING ----------
+
+def build_encounter_rows(enc, run_id, idx: int):
+    """Build (encounter_row, participant_rows) for one encounter dict.
+
+    fastrows.pyx has a Cython build of this function that replaces it when
+    available; keep the two in step.
+    """
+    get = enc.get
+    participant_rows = []
+    append_participant = participant_rows.append
+
+    # Use provided encounter_id or synthesize from run_id + index
+    encounter_id = get("encounter_id")
+    if not encounter_id:
+        encounter_id = f"{run_id}_{idx:03d}"
+
+    # Team snapshot: arrays of species IDs and levels, plus team_size
+    team_species = get("team_species_ids") or []
+    team_levels = get("team_levels") or []
+    team_size = get("team_size")
+
+    enemy_species = get("enemy_species")
+    enemy_level = get("enemy_level")
+
+    # Pad/trim the snapshot to the six wide ally slots
+    ally_species = (team_species + [None] * 6)[:6]
+    ally_levels = (team_levels + [None] * 6)[:6]
+
+    # Wide encounter row (kept for v1 compatibility)
+    encounter_row = (
+        encounter_id,
+        run_id,
+        get("battle_index", idx),
+        enemy_species,
+        _intern(get("enemy_type1")),
+        _intern(get("enemy_type2")),
+        enemy_level,
+        get("is_boss"),
+        _intern(get("encounter_result")),
+        get("enemy_ended_run"),
+        get("notes"),
+
+        # Team snapshot fields (wide): size, ally1..6 species, ally1..6 levels
+        team_size,
+        *ally_species,
+        *ally_levels,
+    )
+
+    # --- NEW: tall participant rows ---
+
+    # Enemy as a participant
+    if enemy_species is not None:
+        append_participant((
+            encounter_id,
+            run_id,
+            "enemy",
+            0,
+            enemy_species,
+            enemy_level,
+        ))
+
+    # Allies as participants (one row per ally slot)
+    for slot_idx, species_id in enumerate(team_species):
+        if species_id is None:
+            continue
+        level = team_levels[slot_idx] if slot_idx < len(team_levels) else None
+        append_participant((
+            encounter_id,
+            run_id,
+            "ally",
+            slot_idx,
+            species_id,
+            level,
+        ))
+
+    return encounter_row, participant_rows
+
+
+try:
+    # Optional: Cython build of the function above (cythonize -i fastrows.pyx)
+    from fastrows import build_encounter_rows
+except ImportError:
+    pass  # Keep the pure-Python build_encounter_rows above
+
+
+def process_file(path: str):
+    """Turn one run file into (run_rows, encounter_rows, participant_rows).
+
+    Rows are tuples in *_FIELDNAMES order. Runs in worker processes, so it
+    must only depend on its argument and module-level state.
+    """
+    run_rows = []
+    encounter_rows = []
+    participant_rows = []  # NEW
 
-def load_run_file(path: Path):
-    """Load a single JSON file and return (run_dict, encounters_list)."""
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    run, encounters = load_run_file(path)
+
+    # --- RUN-LEVEL PROCESSING ---
+    run_id = run.get("run_id")
+    if not run_id:
+        # Fallback: derive from filename if run_id missing
+        run_id = os.path.splitext(os.path.basename(path))[0]
+
+    start_ts_raw = run.get("start_timestamp")
+    end_ts_raw = run.get("end_timestamp")
+
+    # The datetimes feed the derived fields; the CSVs keep the source text
+    start_dt, start_ts = parse_timestamp(start_ts_raw)
+    end_dt, end_ts = parse_timestamp(end_ts_raw)
+
+    # Format the date directly rather than building a date object first
+    session_date = f"{start_dt.year:04d}-{start_dt.month:02d}-{start_dt.day:02d}" if start_dt else None
+    session_dow = start_dt.isoweekday() if start_dt else None
+    tod_bucket = _TOD_TABLE[start_dt.hour] if start_dt else None
+
+    total_battles = run.get("total_battles")
+    if total_battles is None and encounters:
+        total_battles = len(encounters)
+
+    run_rows.append((
+        run_id,
+        start_ts,
+        end_ts,
+        _intern(run.get("result")),
+        _intern(run.get("final_stage")),
+        _intern(run.get("final_boss")),
+        run.get("starter_species"),
+        total_battles,
+        session_date,
+        session_dow,
+        tod_bucket,
+        run.get("run_tag"),
+    ))
+
+    # --- ENCOUNTER-LEVEL + PARTICIPANTS PROCESSING ---
+    # Bound methods hoisted out of the hot loop
+    append_encounter = encounter_rows.append
+    extend_participants = participant_rows.extend
+
+    for idx, enc in enumerate(encounters):
+        encounter_row, enc_participants = build_encounter_rows(enc, run_id, idx)
+        append_encounter(encounter_row)
+        extend_participants(enc_participants)
+
+    return run_rows, encounter_rows, participant_rows
+
+
+def _available_cpus():
+    """Number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def _process_chunk(paths):
+    """Run process_file over a chunk of paths as a single pool task."""
+    return [process_file(path) for path in paths]
+
+
+def _iter_processed(json_files):
+    """Yield process_file() results in file order, in parallel for larger sets.
+
+    With a pool, at most two chunks per worker are queued or finished but not
+    yet consumed, so results cannot pile up ahead of the CSV writer.
+    """
+    workers = _available_cpus()
+    if os.name == "nt":
+        workers = min(workers, WINDOWS_MAX_WORKERS)
+    if workers < 2 or len(json_files) < PARALLEL_MIN_FILES:
+        yield from map(process_file, json_files)
+        return
 
-    run = data.get("run", {})
-    encounters = data.get("encounters", [])
-    return run, encounters
+    chunks = (
+        json_files[start:start + PARALLEL_CHUNKSIZE]
+        for start in range(0, len(json_files), PARALLEL_CHUNKSIZE)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_process_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            results = pending.popleft().result()
+            # Top the queue back up before handing results to the writer
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(executor.submit(_process_chunk, chunk))
+            yield from results
 
 
 # ---------- MAIN ETL ----------
@@ -108,200 +546,63 @@ def main():
     # Ensure output dir exists
     DATA_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
-    run_rows = []
-    encounter_rows = []
-    participant_rows = []  # NEW
-
-    json_files = sorted(DATA_RAW_DIR.glob("*.json"))
+    json_files = list_json_files(DATA_RAW_DIR)
     if not json_files:
         print(f"No JSON files found in {DATA_RAW_DIR.resolve()}")
         return
 
-    for jf in json_files:
-        run, encounters = load_run_file(jf)
-
-        # --- RUN-LEVEL PROCESSING ---
-        run_id = run.get("run_id")
-        if not run_id:
-            # Fallback: derive from filename if run_id missing
-            run_id = jf.stem
-
-        start_ts_raw = run.get("start_timestamp")
-        end_ts_raw = run.get("end_timestamp")
-
-        start_dt = parse_timestamp(start_ts_raw)
-        end_dt = parse_timestamp(end_ts_raw)
-
-        session_date = start_dt.date().isoformat() if start_dt else None
-        session_dow = start_dt.isoweekday() if start_dt else None
-        tod_bucket = time_of_day_bucket(start_dt) if start_dt else None
-
-        total_battles = run.get("total_battles")
-        if total_battles is None and encounters:
-            total_battles = len(encounters)
-
-        run_rows.append({
-            "run_id": run_id,
-            "start_timestamp": start_dt.isoformat() if start_dt else None,
-            "end_timestamp": end_dt.isoformat() if end_dt else None,
-            "result": run.get("result"),
-            "final_stage": run.get("final_stage"),
-            "final_boss": run.get("final_boss"),
-            "starter_species": run.get("starter_species"),
-            "total_battles": total_battles,
-            "session_date": session_date,
-            "session_day_of_week": session_dow,
-            "time_of_day_bucket": tod_bucket,
-            "run_tag": run.get("run_tag"),
-        })
-
-        # --- ENCOUNTER-LEVEL + PARTICIPANTS PROCESSING ---
-        for idx, enc in enumerate(encounters):
-            # Use provided encounter_id or synthesize from run_id + index
-            encounter_id = enc.get("encounter_id")
-            if not encounter_id:
-                encounter_id = f"{run_id}_{idx:03d}"
-
-            # Team snapshot: arrays of species IDs and levels, plus team_size
-            team_species = enc.get("team_species_ids") or []
-            team_levels = enc.get("team_levels") or []
-            team_size = enc.get("team_size")
-
-            # Helper to safely get index i from a list
-            def _at(lst, i):
-                return lst[i] if i < len(lst) else None
-
-            # Wide encounter row (kept for v1 compatibility)
-            encounter_rows.append({
-                "encounter_id": encounter_id,
-                "run_id": run_id,
-                "battle_index": enc.get("battle_index", idx),
-                "enemy_species": enc.get("enemy_species"),
-                "enemy_type1": enc.get("enemy_type1"),
-                "enemy_type2": enc.get("enemy_type2"),
-                "enemy_level": enc.get("enemy_level"),
-                "is_boss": enc.get("is_boss"),
-                "encounter_result": enc.get("encounter_result"),
-                "enemy_ended_run": enc.get("enemy_ended_run"),
-                "notes": enc.get("notes"),
-
-                # Team snapshot fields (wide)
-                "team_size": team_size,
-                "ally1_species_id": _at(team_species, 0),
-                "ally2_species_id": _at(team_species, 1),
-                "ally3_species_id": _at(team_species, 2),
-                "ally4_species_id": _at(team_species, 3),
-                "ally5_species_id": _at(team_species, 4),
-                "ally6_species_id": _at(team_species, 5),
-                "ally1_level": _at(team_levels, 0),
-                "ally2_level": _at(team_levels, 1),
-                "ally3_level": _at(team_levels, 2),
-                "ally4_level": _at(team_levels, 3),
-                "ally5_level": _at(team_levels, 4),
-                "ally6_level": _at(team_levels, 5),
-            })
-
-            # --- NEW: tall participant rows ---
-
-            # Enemy as a participant
-            enemy_species = enc.get("enemy_species")
-            if enemy_species is not None:
-                participant_rows.append({
-                    "encounter_id": encounter_id,
-                    "run_id": run_id,
-                    "side": "enemy",
-                    "slot_index": 0,
-                    "species_id": enemy_species,
-                    "level": enc.get("enemy_level"),
-                })
-
-            # Allies as participants (one row per ally slot)
-            for slot_idx, species_id in enumerate(team_species):
-                if species_id is None:
-                    continue
-                level = team_levels[slot_idx] if slot_idx < len(team_levels) else None
-                participant_rows.append({
-                    "encounter_id": encounter_id,
-                    "run_id": run_id,
-                    "side": "ally",
-                    "slot_index": slot_idx,
-                    "species_id": species_id,
-                    "level": level,
-                })
-
-    # Define column order explicitly to match schema_v1 (with team fields)
-    run_fieldnames = [
-        "run_id",
-        "start_timestamp",
-        "end_timestamp",
-        "result",
-        "final_stage",
-        "final_boss",
-        "starter_species",
-        "total_battles",
-        "session_date",
-        "session_day_of_week",
-        "time_of_day_bucket",
-        "run_tag",
-    ]
-
-    encounter_fieldnames = [
-        "encounter_id",
-        "run_id",
-        "battle_index",
-        "enemy_species",
-        "enemy_type1",
-        "enemy_type2",
-        "enemy_level",
-        "is_boss",
-        "encounter_result",
-        "enemy_ended_run",
-        "notes",
-        "team_size",
-        "ally1_species_id",
-        "ally2_species_id",
-        "ally3_species_id",
-        "ally4_species_id",
-        "ally5_species_id",
-        "ally6_species_id",
-        "ally1_level",
-        "ally2_level",
-        "ally3_level",
-        "ally4_level",
-        "ally5_level",
-        "ally6_level",
-    ]
-
-    participant_fieldnames = [  # NEW
-        "encounter_id",
-        "run_id",
-        "side",
-        "slot_index",
-        "species_id",
-        "level",
-    ]
-
-    # Write runs.csv
-    with RUNS_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=run_fieldnames)
-        writer.writeheader()
-        writer.writerows(run_rows)
-
-    # Write encounters.csv
-    with ENCOUNTERS_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=encounter_fieldnames)
-        writer.writeheader()
-        writer.writerows(encounter_rows)
-
-    # Write encounter_participants.csv
-    with PARTICIPANTS_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=participant_fieldnames)
-        writer.writeheader()
-        writer.writerows(participant_rows)
-
-    print(f"Wrote {len(run_rows)} runs to {RUNS_CSV}")
-    print(f"Wrote {len(encounter_rows)} encounters to {ENCOUNTERS_CSV}")
-    print(f"Wrote {len(participant_rows)} participants to {PARTICIPANTS_CSV}")
+    run_count = 0
+    encounter_count = 0
+    participant_count = 0  # NEW
+
+    # Row batches, flushed every CSV_BATCH_ROWS rows
+    run_rows = []
+    encounter_rows = []
+    participant_rows = []
+
+    # Open all outputs up front and stream rows out in batches, so memory
+    # stays flat no matter how many runs have been logged
+    with _open_csv(RUNS_CSV) as runs_f, \
+         _open_csv(ENCOUNTERS_CSV) as encounters_f, \
+         _open_csv(PARTICIPANTS_CSV) as participants_f, \
+         _open_encounters_parquet() as parquet_writer:
+        # Plain csv.writer with rows as tuples in *_FIELDNAMES order; avoids
+        # DictWriter's per-field dict lookups on every row. Batches are
+        # serialized inside writerows' C loop. pyarrow.csv is deliberately not
+        # used: it quotes every string, writes booleans as true/false and
+        # drops trailing ".0" on floats, which would change the schema_v1 files.
+        # Pre-formatting "safe" rows as joined strings was also measured and
+        # came out slower than writerows, so every row goes through csv.writer.
+        run_writer = csv.writer(runs_f)
+        encounter_writer = csv.writer(encounters_f)
+        participant_writer = csv.writer(participants_f)
+        run_writer.writerow(RUN_FIELDNAMES)
+        encounter_writer.writerow(ENCOUNTER_FIELDNAMES)
+        participant_writer.writerow(PARTICIPANT_FIELDNAMES)
+
+        for file_runs, file_encounters, file_participants in _iter_processed(json_files):
+            run_rows.extend(file_runs)
+            encounter_rows.extend(file_encounters)
+            participant_rows.extend(file_participants)
+
+            if len(run_rows) >= CSV_BATCH_ROWS:
+                run_count += _flush_rows(run_writer, run_rows)
+            if len(encounter_rows) >= CSV_BATCH_ROWS:
+                count, parquet_writer = _flush_encounters(encounter_writer, parquet_writer, encounter_rows)
+                encounter_count += count
+            if len(participant_rows) >= CSV_BATCH_ROWS:
+                participant_count += _flush_rows(participant_writer, participant_rows)
+
+        run_count += _flush_rows(run_writer, run_rows)
+        count, parquet_writer = _flush_encounters(encounter_writer, parquet_writer, encounter_rows)
+        encounter_count += count
+        participant_count += _flush_rows(participant_writer, participant_rows)
+
+    print(f"Wrote {run_count} runs to {RUNS_CSV}")
+    print(f"Wrote {encounter_count} encounters to {ENCOUNTERS_CSV}")
+    print(f"Wrote {participant_count} participants to {PARTICIPANTS_CSV}")
+    if parquet_writer is not None:
+        print(f"Wrote {encounter_count} encounters to {ENCOUNTERS_PARQUET}")
 
 
 if __name__ == "__main__":